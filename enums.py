@@ -1,6 +1,7 @@
-from enum import Enum, auto
+from enum import Enum, IntEnum, auto
 
-class GridState(Enum):
+# IntEnum so members can be stored in and compared against uint8 grid arrays
+class GridState(IntEnum):
     START = auto()
     GOAL = auto()
     OBSTACLE = auto()
@@ -22,9 +23,3 @@ class Algorithm(Enum):
     A_STAR = "A*"
     GREEDY_BFS = "Greedy Best First Search"
     BEAM = "Beam Search"
-
-class Cell:
-    def __init__(self, gridState=GridState.UNEXPLORED):
-        self.gridState = gridState
-        self.ancestor = None
-        # self.pos Is this needed?
@@ -15,25 +15,47 @@ Users can:
 - Run algorithms step-by-step or continuously
 - Compare algorithm performance
 - Save and load mazes
+
+Set the GRID_SIZE environment variable to change the grid size (15 by default,
+from 2 to 335), and FEATURES to a comma-separated subset of "save,analyze" to
+choose which of those buttons are shown (both by default).
 """
-from search import SearchManager
-from enums import GridState, EditMode, Algorithm, Cell
+from search import SearchManager, submit_comparison
+from search_numba import NUMBA_AVAILABLE, njit
+from enums import GridState, EditMode, Algorithm
 import pygame
 import pygame_widgets
 from pygame_widgets.dropdown import Dropdown
 from pygame_widgets.button import ButtonArray
-import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import os
-import csv
-import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 # Constants
-SCREEN_SIZE = 1005
-GRID_SIZE = 15 # NOTE: If you change this, any existing maze won't work
-CELL_SIZE = SCREEN_SIZE // GRID_SIZE
+MAX_SCREEN_SIZE = 1005 # Largest window, the grid gets the biggest cells that fit in it
+MIN_CELL_SIZE = 3 # Smallest cell that still shows its color between the grid lines
+MAX_GRID_SIZE = MAX_SCREEN_SIZE // MIN_CELL_SIZE
+OPTIONAL_FEATURES = {"save", "analyze"}
+try:
+    GRID_SIZE = int(os.environ.get("GRID_SIZE", 15)) # NOTE: A saved maze only loads at the size it was saved with
+except ValueError:
+    raise SystemExit(f"GRID_SIZE must be a whole number, not {os.environ['GRID_SIZE']!r}") from None
+if not 2 <= GRID_SIZE <= MAX_GRID_SIZE:
+    raise SystemExit(f"GRID_SIZE must be from 2 to {MAX_GRID_SIZE}, not {GRID_SIZE}")
+FEATURES = {feature.strip() for feature in os.environ.get("FEATURES", "save,analyze").split(",")} - {""} # Optional buttons to show
+if not FEATURES <= OPTIONAL_FEATURES:
+    raise SystemExit(f"Unknown FEATURES {sorted(FEATURES - OPTIONAL_FEATURES)}, choose from {sorted(OPTIONAL_FEATURES)}")
+CELL_SIZE = MAX_SCREEN_SIZE // GRID_SIZE
+SCREEN_SIZE = GRID_SIZE * CELL_SIZE # NOTE: The window is cut to the grid, so every click lands on a cell
+FPS = 30 # Maximum frame rate
+EVENT_TIMEOUT = 1000 # Longest the main loop sleeps (ms) when no events arrive
+STEP_EVENT = pygame.USEREVENT + 1 # Posted by a timer while a search is playing
+STEP_INTERVAL = 250 # Time between search steps while playing (ms)
+ANALYSIS_DONE = pygame.USEREVENT + 2 # Posted when an analysis worker (search or chart) finishes
+ANALYSIS_ALGORITHMS = [Algorithm.BFS, Algorithm.DFS, Algorithm.GREEDY_BFS, Algorithm.A_STAR]
 WHITE = (255, 255, 255) # unvisited
 BLACK = (0, 0, 0)       # obstacles
 GREEN = (0, 255, 0)     # start
@@ -41,153 +63,371 @@ YELLOW = (255, 255, 0)  # goal
 GREY = (169, 169, 169)  # explored
 BLUE = (0, 0, 255)      # last visited cell
 PATH = (255, 0, 0)      # Color for path to goal
-MAZE_FILE_PATH = "maze.csv"
+MAZE_FILE_PATH = "maze.npy"
+CSV_MAZE_FILE_PATH = "maze.csv" # Format used by older versions, migrated on startup
+COLOR_BY_STATE = {
+    GridState.UNEXPLORED: WHITE,
+    GridState.SEEN: GREY,
+    GridState.OBSTACLE: BLACK,
+    GridState.START: GREEN,
+    GridState.GOAL: YELLOW,
+    GridState.CURRENT: BLUE,
+    GridState.PATH: PATH,
+}
+# Colors indexed directly by a GridState value from the state array. Values
+# start at 1 (index 0 is never drawn), and a state without a color or a gap in
+# the values fails here at import rather than when drawing
+COLOR_LUT = (WHITE,) + tuple(COLOR_BY_STATE[GridState(value)] for value in range(1, max(GridState) + 1))
+PALETTE = np.array(COLOR_LUT, dtype=np.uint8)
+BORDER = np.array(BLACK, dtype=np.uint8)
+# Whether each uint8 value is a GridState, for validating loaded mazes
+IS_GRID_STATE = np.zeros(256, dtype=bool)
+IS_GRID_STATE[list(GridState)] = True
+# Screen rect of every cell, indexed by its flattened index row * GRID_SIZE + col
+CELL_RECTS = tuple(
+    pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+    for row in range(GRID_SIZE) for col in range(GRID_SIZE)
+)
 
-def save_maze(grid_state):
+def save_maze(state):
     """
-    Save the current maze configuration to a CSV file.
+    Save the current maze configuration to a NumPy .npy file.
     
     Args:
-        grid_state (list): 2D grid of Cell objects representing the maze.
+        state (np.ndarray): 2D uint8 array of GridState values representing the maze.
     """
-    with open(MAZE_FILE_PATH, 'w', newline='') as f:
-        writer = csv.writer(f)
-        for row in grid_state:
-            # Convert enum to int values for storage
-            writer.writerow([cell.gridState.value for cell in row])
+    np.save(MAZE_FILE_PATH, state)
     print(f"Maze saved to {MAZE_FILE_PATH}")
 
+def migrate_csv_maze():
+    """
+    Convert a maze saved as CSV by older versions into the .npy format.
+    
+    Only runs when there is a CSV maze but no .npy maze yet.
+    """
+    if os.path.exists(MAZE_FILE_PATH) or not os.path.exists(CSV_MAZE_FILE_PATH):
+        return
+    
+    try:
+        state = np.loadtxt(CSV_MAZE_FILE_PATH, dtype=np.uint8, delimiter=',', ndmin=2)
+        np.save(MAZE_FILE_PATH, state)
+        print(f"Maze migrated from {CSV_MAZE_FILE_PATH} to {MAZE_FILE_PATH}")
+    except Exception as e:
+        print(f"Error migrating maze: {e}")
+
 def load_maze():
     """
-    Load a maze configuration from a CSV file.
+    Load a maze configuration from a NumPy .npy file.
     
     Returns:
-        list or None: 2D grid of GridState values if successful, None otherwise.
+        np.ndarray or None: 2D uint8 array of GridState values if successful, None otherwise.
     """
     if not os.path.exists(MAZE_FILE_PATH):
         return None
     
     try:
-        with open(MAZE_FILE_PATH, 'r', newline='') as f:
-            reader = csv.reader(f)
-            grid = []
-            for row in reader:
-                if not row:
-                    continue
-                grid_row = []
-                for cell in row:
-                    # Convert back from int to GridState enum
-                    grid_row.append(GridState(int(cell)))
-                grid.append(grid_row)
-            
-            # Validate grid dimensions
-            if len(grid) == GRID_SIZE and all(len(row) == GRID_SIZE for row in grid):
-                print(f"Maze loaded from {MAZE_FILE_PATH}")
-                return grid
+        grid = np.load(MAZE_FILE_PATH)
+        
+        # Validate grid type, dimensions and that every value is a GridState
+        if grid.dtype == np.uint8 and grid.shape == (GRID_SIZE, GRID_SIZE) and IS_GRID_STATE[grid].all():
+            print(f"Maze loaded from {MAZE_FILE_PATH}")
+            return grid
     except Exception as e:
         print(f"Error loading maze: {e}")
     
     return None
 
-def grid(state : list[list[Cell]]):
+def build_gridlines_surface():
+    """
+    Pre-render the grid lines into a transparent overlay surface.
+    
+    Returns:
+        pygame.Surface: Per-pixel alpha surface holding only the cell borders.
+    """
+    surface = pygame.Surface((SCREEN_SIZE, SCREEN_SIZE), pygame.SRCALPHA)
+    for rect in CELL_RECTS:
+        pygame.draw.rect(surface, BLACK, rect, 1)
+    return surface
+
+def build_cell_surfaces():
+    """
+    Pre-render a cell, border included, in the color of every GridState.
+    
+    Returns:
+        tuple: Cell-sized surfaces indexed by GridState value, like COLOR_LUT.
+    """
+    surfaces = []
+    for color in COLOR_LUT:
+        surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
+        surface.fill(color)
+        pygame.draw.rect(surface, BLACK, surface.get_rect(), 1)
+        surfaces.append(surface)
+    return tuple(surfaces)
+
+@njit(cache=True)
+def render_cells(state, palette, border, pixels):
+    """
+    Paint every cell of the grid, border included, into a pixel array.
+    
+    Only used when Numba is available: uncompiled, looping over every pixel
+    is far slower than grid()'s NumPy fallback.
+    
+    Args:
+        state (np.ndarray): 2D uint8 array of GridState values.
+        palette (np.ndarray): (n, 3) uint8 colors indexed by GridState value.
+        border (np.ndarray): uint8 RGB color of the cell borders.
+        pixels (np.ndarray): (width, height, 3) uint8 array indexed [x][y] like
+            surfarray, filled in place.
+    """
+    size = state.shape[0]
+    cell = pixels.shape[0] // size
+    # Walk the pixels in memory order: x, then y, then the color channel
+    for col in range(size):
+        for dx in range(cell):
+            x = col * cell + dx
+            vertical_line = dx == 0 or dx == cell - 1
+            for row in range(size):
+                color = palette[state[row, col]]
+                for dy in range(cell):
+                    y = row * cell + dy
+                    if vertical_line or dy == 0 or dy == cell - 1:
+                        pixels[x, y, 0], pixels[x, y, 1], pixels[x, y, 2] = border[0], border[1], border[2]
+                    else:
+                        pixels[x, y, 0], pixels[x, y, 1], pixels[x, y, 2] = color[0], color[1], color[2]
+
+def grid(state : np.ndarray, dirty_cells : set[int]):
     """
     Render the grid to the screen based on cell states.
     
+    Cells that changed since the last frame are repainted on the cached grid
+    surface by blitting the pre-rendered cell (border included) for their
+    state. When more than a row's worth changed (loading, resetting) the
+    surface is instead rebuilt in one pass: render_cells paints the whole
+    grid into grid_pixels, which is copied in with surfarray. Without Numba
+    every state is looked up in PALETTE, scaled up to cell size and copied in,
+    and the grid line overlay is drawn on top. Either way the grid lines are
+    part of the cached surface, which is then blitted to the screen.
+    
     Args:
-        state (list): 2D grid of Cell objects to render.
-    """
-    for row in range(GRID_SIZE):
-        for col in range(GRID_SIZE):
-            rect = pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            match state[row][col].gridState:
-                case GridState.UNEXPLORED:
-                    pygame.draw.rect(screen, WHITE, rect)
-                case GridState.SEEN:
-                    pygame.draw.rect(screen, GREY, rect)
-                case GridState.OBSTACLE:
-                    pygame.draw.rect(screen, BLACK, rect)
-                case GridState.START:
-                    pygame.draw.rect(screen, GREEN, rect)
-                case GridState.GOAL:
-                    pygame.draw.rect(screen, YELLOW, rect)
-                case GridState.CURRENT:
-                    pygame.draw.rect(screen, BLUE, rect)
-                case GridState.PATH:
-                    pygame.draw.rect(screen, PATH, rect)
-            pygame.draw.rect(screen, (0, 0, 0), rect, 1)  # Grid line
+        state (np.ndarray): 2D uint8 array of GridState values to render.
+        dirty_cells (set): Flattened indices (row * GRID_SIZE + col) of cells that changed.
+    
+    Returns:
+        list: Screen rects of the grid that changed, for pygame.display.update.
+    """
+    if len(dirty_cells) <= GRID_SIZE:
+        changed = [CELL_RECTS[index] for index in dirty_cells]
+        for index in dirty_cells:
+            # item() gives a plain int, cheaper to index the tuple with than a NumPy scalar
+            grid_surface.blit(cell_surfaces[state.item(index)], CELL_RECTS[index])
+    else:
+        changed = [grid_surface.get_rect()]
+        if NUMBA_AVAILABLE:
+            render_cells(state, PALETTE, BORDER, grid_pixels)
+            pygame.surfarray.blit_array(grid_surface, grid_pixels)
+        else:
+            small = PALETTE[state]
+            big = np.repeat(np.repeat(small, CELL_SIZE, axis=0), CELL_SIZE, axis=1)
+            # surfarray is indexed [x][y], so swap rows and columns
+            pygame.surfarray.blit_array(grid_surface, big.swapaxes(0, 1))
+            grid_surface.blit(gridlines_surface, (0, 0))
+    screen.blit(grid_surface, (0, 0))
+    return changed
 
 def play_search():
     """
-    Start a thread to continuously run the selected search algorithm.
+    Start continuously running the selected search algorithm.
     
-    Creates a new thread if one doesn't exist or isn't running.
+    Starts a timer posting STEP_EVENT every STEP_INTERVAL ms, each of which
+    runs one step from the main loop (see run_search_step). Does nothing if a
+    search is already playing.
     """
-    global play_thread
-    if play_thread is None or not play_thread.is_alive():
-        end_event.clear()
-        pause_event.clear()
-        play_thread = threading.Thread(target=run_search)
-        play_thread.start()
+    global playing, paused
+    if not playing:
+        playing = True
+        paused = False
+        pygame.time.set_timer(STEP_EVENT, STEP_INTERVAL)
 
-def run_search():
+def run_search_step():
     """
-    Thread function that continuously executes the selected algorithm until
-    completion or until stopped/paused.
+    Handle a STEP_EVENT: run one step of the playing search unless paused or
+    stopped (a step can already be queued when pausing or resetting), and stop
+    playing once the search has finished.
+    
+    NOTE: Steps run on the main thread between frames, so the grid is never
+    changed while it is being drawn.
     """
-    while not end_event.is_set() and not searchManager.finished:
-        if not pause_event.is_set():
-            searchManager.search(algo_dropdown.getSelected())
-            pygame.time.wait(250)
+    if paused or not playing:
+        return
+    searchManager.step()
+    if searchManager.finished:
+        stop_search()
+
+def stop_search():
+    """
+    Stop playing the search by cancelling the step timer.
+    """
+    global playing
+    playing = False
+    pygame.time.set_timer(STEP_EVENT, 0)
 
 def toggle_pause():
     """
     Toggle the pause state of the search algorithm execution.
+    
+    The step timer is stopped while a playing search is paused, so the main
+    loop sleeps instead of waking up for steps it would skip.
     """
-    if pause_event.is_set():
-        pause_event.clear()
-    else:
-        pause_event.set()
+    global paused
+    paused = not paused
+    if playing:
+        pygame.time.set_timer(STEP_EVENT, 0 if paused else STEP_INTERVAL)
 
 def reset():
     """
     Stop any running search and reset the grid to its initial state.
     """
-    global play_thread
-    if play_thread is not None:
-        end_event.set()
-        play_thread.join()
-        play_thread = None
+    stop_search()
     searchManager.reset()
 
 def run_analysis():
     """
-    Run all algorithms sequentially and compare their performance.
+    Run all algorithms in parallel and compare their performance.
     
+    Each algorithm runs in its own worker process on a snapshot of the maze,
+    and so does drawing the chart afterwards. The work is only submitted
+    here, so the window stays responsive while it runs, and finish_analysis
+    picks up the results as the workers finish.
     For each algorithm, measures:
     - Number of cells visited
     - Path length
     
-    Displays results in a bar chart for visual comparison.
+    Results are cached per maze, so analyzing an unchanged maze again shows them
+    right away. Does nothing while an analysis is already running.
     """
-    algorithms = [Algorithm.BFS, Algorithm.DFS, Algorithm.GREEDY_BFS, Algorithm.A_STAR]
-    results = []
-     
-    for algo in algorithms:
-        searchManager.reset()
-        
-        # Run algorithm and collect results
-        result = searchManager.run_algorithm_to_completion(algo)
-        results.append(result)
+    global pending_analysis
+    if pending_analysis is not None or pending_chart is not None:
+        return
+    if searchManager.start_pos is None or searchManager.goal_pos is None:
+        print("Set a start and a goal before analyzing the maze")
+        return
+    reset()
+    key = searchManager.analysis_key()
+    results = searchManager.analysis_cache.get(key)
+    if results is not None:
+        show_analysis(results)
+        return
+    
+    futures = submit_comparison(analysis_pool(), searchManager.state, searchManager.start_pos,
+                                searchManager.goal_pos, ANALYSIS_ALGORITHMS)
+    pending_analysis = (key, [notify_when_done(future) for future in futures])
+
+def analysis_pool():
+    """
+    Get the analysis worker pool.
+    
+    The pool is started on first use and kept between analyses, so the worker
+    processes only start once.
+    
+    Returns:
+        ProcessPoolExecutor: The pool.
+    """
+    global analysis_executor
+    if analysis_executor is None:
+        analysis_executor = ProcessPoolExecutor(max_workers=len(ANALYSIS_ALGORITHMS))
+    return analysis_executor
+
+def notify_when_done(future):
+    """
+    Post ANALYSIS_DONE when an analysis worker finishes.
+    
+    Args:
+        future (Future): The pending result of the worker.
+    
+    Returns:
+        Future: The same future.
+    """
+    # Done callbacks run on a pool thread, posting an event wakes the main loop
+    future.add_done_callback(lambda future: pygame.event.post(pygame.event.Event(ANALYSIS_DONE)))
+    return future
+
+def finish_analysis():
+    """
+    Handle an ANALYSIS_DONE event: show the chart once it is drawn, and once
+    every search of the running analysis is done, cache and show its results.
+    """
+    global pending_analysis, pending_chart, analysis_overlay
+    if pending_chart is not None and pending_chart.done():
+        chart, pending_chart = pending_chart, None
+        try:
+            pixels, size = chart.result()
+            analysis_overlay = pygame.image.frombuffer(pixels, size, "RGBA")
+            # Large grids can leave the window smaller than the chart
+            scale = min(1, SCREEN_SIZE / size[0], SCREEN_SIZE / size[1])
+            if scale < 1:
+                analysis_overlay = pygame.transform.smoothscale(analysis_overlay, (int(size[0] * scale), int(size[1] * scale)))
+        except Exception as e:
+            analysis_failed(f"Error drawing analysis chart: {e}", e)
+    
+    if pending_analysis is None:
+        return
+    key, futures = pending_analysis
+    if not all(future.done() for future in futures):
+        return
+    
+    pending_analysis = None
+    try:
+        # Results are in ANALYSIS_ALGORITHMS order, the order the tasks were submitted in
+        results = [future.result() for future in futures]
+    except Exception as e:
+        analysis_failed(f"Error running analysis: {e}", e)
+        return
+    searchManager.analysis_cache[key] = results
+    show_analysis(results)
+
+def analysis_failed(message, error):
+    """
+    Report a failed analysis worker, dropping the pool if the failure broke it.
+    
+    Args:
+        message (str): What to print.
+        error (Exception): The exception the worker's future raised.
+    """
+    global analysis_executor
+    print(message)
+    # A worker process that died leaves the pool unusable, the next analysis starts a new one
+    if isinstance(error, BrokenProcessPool):
+        analysis_executor.shutdown(wait=False, cancel_futures=True)
+        analysis_executor = None
+
+def show_analysis(results):
+    """
+    Print the analysis results and start drawing them as a bar chart for
+    visual comparison (shown by finish_analysis when ready).
+    
+    Args:
+        results (list): Result dictionaries in ANALYSIS_ALGORITHMS order.
+    """
+    global pending_chart
+    for algo, result in zip(ANALYSIS_ALGORITHMS, results):
         print(f"{algo.value}: Visited {result['cells_visited']} cells, Path length: {result['path_length']}")
     
-    visualize_results(results)
+    pending_chart = notify_when_done(analysis_pool().submit(visualize_results, results))
 
 def visualize_results(results):
     """
-    Create and display a matplotlib visualization comparing algorithm performance.
+    Create a matplotlib visualization comparing algorithm performance.
+    
+    Runs in an analysis worker process. The chart is rendered off-screen with
+    the Agg backend and saved to algorithm_analysis.png. Its pixels are
+    returned so the main process can show it as an overlay inside the pygame
+    window (dismissed by a click) instead of blocking on a plot window.
     
     Args:
         results (list): List of dictionaries containing algorithm performance metrics.
+    
+    Returns:
+        tuple: (pixels, (width, height)) - the chart as RGBA bytes and its size.
     """
     # Extract data for plotting
     algorithm_names = [result['algorithm'] for result in results]
@@ -198,7 +438,9 @@ def visualize_results(results):
     x = np.arange(len(algorithm_names))
     width = 0.35
     
-    fig, ax = plt.subplots(figsize=(12,8))
+    fig = Figure(figsize=(12,8), dpi=80) # 960x640 pixels, scaled down to fit smaller windows
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
     rects1 = ax.bar(x - width/2, cells_visited, width, label='Cells Visited')
     rects2 = ax.bar(x + width/2, path_lengths, width, label='Path Length')
     
@@ -211,23 +453,34 @@ def visualize_results(results):
     ax.legend()
     
     # Add data labels on bars
-    def autolabel(rects):
-        """Add text labels to each bar in the chart."""
-        for rect in rects:
-            height = rect.get_height()
-            ax.annotate(f'{height}',
-                        xy=(rect.get_x() + rect.get_width() / 2, height),
-                        xytext=(0, 3),
-                        textcoords="offset points",
-                        ha='center', va='bottom')
-    
-    autolabel(rects1)
-    autolabel(rects2)
-    
-    # Display the plot
-    plt.tight_layout()
-    plt.savefig('algorithm_analysis.png')
-    plt.show()
+    ax.bar_label(rects1, padding=3)
+    ax.bar_label(rects2, padding=3)
+    
+    # Render the plot
+    fig.tight_layout()
+    fig.savefig('algorithm_analysis.png', dpi=100)
+    canvas.draw()
+    return bytes(canvas.buffer_rgba()), canvas.get_width_height()
+
+def refresh_selections(events):
+    """
+    Re-read the dropdown selections into their cached values.
+    
+    A selection can only change on a mouse click, so the widgets are only
+    queried on frames with mouse button events. Switching algorithms resets
+    any search in progress.
+    
+    Args:
+        events (list): Events handled this frame.
+    """
+    global edit_mode
+    if any(event.type == pygame.MOUSEBUTTONDOWN or event.type == pygame.MOUSEBUTTONUP for event in events):
+        algo = algo_dropdown.getSelected()
+        if algo != searchManager.selected_algo:
+            # A search in progress can't be continued by another algorithm
+            reset()
+            searchManager.select_algorithm(algo)
+        edit_mode = edit_mode_dropdown.getSelected()
 
 def pos_on_button(pos):
     """
@@ -240,105 +493,167 @@ def pos_on_button(pos):
         bool: True if position is over a UI element, False otherwise.
     """
     dropdown_open = algo_dropdown.isDropped() or edit_mode_dropdown.isDropped()
-    y_in_range = 10 <= pos[1] <= 60
-    x_in_range = 10 <= pos[0] <= 110 or 120 <= pos[0] <= 220 or 230 <= pos[0] <= 530
-    return dropdown_open or (y_in_range and x_in_range)
-
-# Set up pygame
-pygame.init()
-screen = pygame.display.set_mode((SCREEN_SIZE, SCREEN_SIZE))
-pygame.display.set_caption("Interactable Pathfinding Visualizer")
-running = True
-
-# Set up search manager (manages grid and algorithms state)
-searchManager = SearchManager(_size=GRID_SIZE)
-
-# Try to load maze from file
-saved_grid = load_maze()
-if saved_grid:
-    # Convert the loaded grid states to Cell objects
-    for r in range(GRID_SIZE):
-        for c in range(GRID_SIZE):
-            searchManager.grid[r][c] = Cell(saved_grid[r][c])
-            # Find start and goal positions
-            if saved_grid[r][c] == GridState.START:
-                searchManager.set_start((r, c))
-            elif saved_grid[r][c] == GridState.GOAL:
-                searchManager.set_goal((r, c))
-
-# Set up UI elements - Algorithm selector dropdown
-algo_dropdown = Dropdown(
-    screen, 10, 10, 100, 50, name="Algorithms",
-    choices=[algo.value for algo in Algorithm],
-    values=[algo for algo in Algorithm],
-    borderRadius=5
-)
+    return dropdown_open or any(rect.collidepoint(pos) for rect in UI_RECTS)
 
-# Edit mode selector dropdown (start, goal, obstacles)
-edit_mode_dropdown = Dropdown(
-    screen, 120, 10, 100, 50, name="Edit Mode",
-    choices=[mode.name for mode in EditMode],
-    values=[mode for mode in EditMode],
-    borderRadius=5
-)
+def set_goal_on_empty(pos):
+    """
+    Move the goal to a cell, unless it is the start or an obstacle.
+    
+    Args:
+        pos (tuple): (row, col) coordinates of the clicked cell.
+    """
+    if searchManager.state[pos] == GridState.UNEXPLORED:
+        searchManager.set_goal(pos)
 
-# Initialize threading control events
-play_thread = None
-pause_event = threading.Event()
-end_event = threading.Event()
-
-# Create control buttons (play, pause, step, reset, save, analyze)
-simulation_control_buttons = ButtonArray(
-    screen, 230, 10, 300, 50, (6,1), border=0,
-    texts=('play', 'pause', 'next', 'reset', 'save', 'analyze'),
-    onClicks=(
-        lambda: play_search(),
-        lambda: toggle_pause(),
-        lambda: searchManager.search(algo_dropdown.getSelected()),
-        lambda: reset(),
-        lambda: save_maze(searchManager.grid),
-        lambda: run_analysis()
+# Worker processes for the analysis import this module, only the main process runs the app
+if __name__ == "__main__":
+    # Set up pygame
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_SIZE, SCREEN_SIZE))
+    pygame.display.set_caption("Interactable Pathfinding Visualizer")
+    running = True
+
+    # Cached render of the grid, only dirty cells are repainted each frame
+    grid_surface = pygame.Surface((GRID_SIZE * CELL_SIZE, GRID_SIZE * CELL_SIZE))
+    # The compiled redraw in grid() renders into a pixel buffer, the NumPy one
+    # needs the grid lines as a separate overlay instead
+    grid_pixels = np.empty((GRID_SIZE * CELL_SIZE, GRID_SIZE * CELL_SIZE, 3), dtype=np.uint8) if NUMBA_AVAILABLE else None
+    gridlines_surface = None if NUMBA_AVAILABLE else build_gridlines_surface()
+    cell_surfaces = build_cell_surfaces()
+
+    # Set up search manager (manages grid and algorithms state)
+    searchManager = SearchManager(_size=GRID_SIZE)
+    # What clicking a grid cell does in each edit mode, called with its (row, col)
+    EDIT_ACTIONS = {
+        EditMode.START: searchManager.set_start,
+        EditMode.GOAL: set_goal_on_empty,
+        EditMode.OBSTACLES: searchManager.toggle_obstacle,
+    }
+
+    # Try to load maze from file
+    migrate_csv_maze()
+    saved_grid = load_maze()
+    if saved_grid is not None:
+        searchManager.state[:] = saved_grid
+        # Find start and goal positions
+        for r, c in np.argwhere(saved_grid == GridState.START):
+            searchManager.set_start((int(r), int(c)))
+        for r, c in np.argwhere(saved_grid == GridState.GOAL):
+            searchManager.set_goal((int(r), int(c)))
+
+    # Set up UI elements - Algorithm selector dropdown
+    algo_dropdown = Dropdown(
+        screen, 10, 10, 100, 50, name="Algorithms",
+        choices=[algo.value for algo in Algorithm],
+        values=[algo for algo in Algorithm],
+        borderRadius=5
     )
-)
 
-# Main application loop
-while running:
-    # Poll for events
-    events = pygame.event.get()
-    for event in events:
-        # pygame.QUIT event means the user clicked X to close your window
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            pos = pygame.mouse.get_pos()
-
-            # Handle grid cell clicks (if not clicking on a UI element)
-            if not pos_on_button(pos):
-                row, col = pos[1] // CELL_SIZE, pos[0] // CELL_SIZE
-                edit_choice = edit_mode_dropdown.getSelected()
-                match edit_choice:
-                    case EditMode.START:
-                        searchManager.set_start((row, col))
-                    case EditMode.GOAL:
-                        if searchManager.grid[row][col].gridState == GridState.UNEXPLORED:
-                            searchManager.set_goal((row, col))
-                    case EditMode.OBSTACLES:
-                        if searchManager.grid[row][col].gridState == GridState.UNEXPLORED:
-                            searchManager.grid[row][col].gridState = GridState.OBSTACLE
-                        elif searchManager.grid[row][col].gridState == GridState.OBSTACLE:
-                            searchManager.grid[row][col].gridState = GridState.UNEXPLORED
-
-    # Fill screen with background color
-    screen.fill("white")
-
-    # Render the grid
-    grid(searchManager.grid)
-
-    # Update pygame widgets (UI elements)
-    pygame_widgets.update(events)
-
-    # Update the display
-    pygame.display.update() 
-
-# Clean up and exit
-pygame.quit()
\ No newline at end of file
+    # Edit mode selector dropdown (start, goal, obstacles)
+    edit_mode_dropdown = Dropdown(
+        screen, 120, 10, 100, 50, name="Edit Mode",
+        choices=[mode.name for mode in EditMode],
+        values=[mode for mode in EditMode],
+        borderRadius=5
+    )
+    # Cached dropdown selections (see refresh_selections)
+    edit_mode = edit_mode_dropdown.getSelected()
+
+    # Analysis chart shown over a dimmed grid until clicked away
+    analysis_overlay = None
+    dim_surface = pygame.Surface((SCREEN_SIZE, SCREEN_SIZE), pygame.SRCALPHA)
+    dim_surface.fill((0, 0, 0, 160))
+    # Worker pool for run_analysis (started on first use) and the work it is running
+    analysis_executor = None
+    pending_analysis = None
+    pending_chart = None
+
+    # Search playback state (see play_search)
+    playing = False
+    paused = False
+
+    # Create control buttons (play, pause, step, reset, and save and analyze if enabled)
+    buttons = [
+        ('play', lambda: play_search()),
+        ('pause', lambda: toggle_pause()),
+        ('next', lambda: searchManager.step()),
+        ('reset', lambda: reset()),
+    ]
+    if 'save' in FEATURES:
+        buttons.append(('save', lambda: save_maze(searchManager.state)))
+    if 'analyze' in FEATURES:
+        buttons.append(('analyze', lambda: run_analysis()))
+    simulation_control_buttons = ButtonArray(
+        screen, 230, 10, 50 * len(buttons), 50, (len(buttons), 1), border=0,
+        texts=tuple(text for text, _ in buttons),
+        onClicks=tuple(on_click for _, on_click in buttons)
+    )
+
+    # Screen area of each UI element, taken from the widgets so it stays in sync
+    # (one pixel larger so the right and bottom edges count as on the widget)
+    UI_RECTS = [
+        pygame.Rect(widget.getX(), widget.getY(), widget.getWidth() + 1, widget.getHeight() + 1)
+        for widget in (algo_dropdown, edit_mode_dropdown, simulation_control_buttons)
+    ]
+
+    clock = pygame.time.Clock()
+    # Whether the last frame had to update the whole display (see the end of the loop)
+    full_update = True
+
+    # Main application loop
+    while running:
+        # Sleep until there is input or the next search step is due,
+        # unless the last frame's button actions left cells to draw
+        if searchManager.dirty_cells:
+            event = pygame.event.poll()
+        else:
+            event = pygame.event.wait(EVENT_TIMEOUT)
+        events = pygame.event.get()
+        if event.type != pygame.NOEVENT:
+            events.insert(0, event)
+        for event in events:
+            if event.type == STEP_EVENT:
+                run_search_step()
+            elif event.type == ANALYSIS_DONE:
+                finish_analysis()
+            # pygame.QUIT event means the user clicked X to close your window
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.MOUSEBUTTONUP and analysis_overlay is not None:
+                analysis_overlay = None
+            elif event.type == pygame.MOUSEBUTTONDOWN and analysis_overlay is None:
+                pos = pygame.mouse.get_pos()
+
+                # Handle grid cell clicks (if not clicking on a UI element)
+                edit_action = EDIT_ACTIONS.get(edit_mode)
+                if edit_action is not None and not pos_on_button(pos):
+                    edit_action((pos[1] // CELL_SIZE, pos[0] // CELL_SIZE))
+
+        # Render the grid (the cached grid surface covers the whole screen)
+        changed_rects = grid(searchManager.state, searchManager.take_dirty_cells())
+
+        if analysis_overlay is None:
+            # Update pygame widgets (UI elements)
+            pygame_widgets.update(events)
+            refresh_selections(events)
+        if analysis_overlay is not None:
+            # Widgets are left alone so clicks on the overlay don't reach them
+            screen.blit(dim_surface, (0, 0))
+            screen.blit(analysis_overlay, analysis_overlay.get_rect(center=screen.get_rect().center))
+
+        # Update only the changed cells and the widgets, unless something was drawn
+        # over the grid this frame or the last (open dropdown, analysis overlay)
+        overdrawn = analysis_overlay is not None or algo_dropdown.isDropped() or edit_mode_dropdown.isDropped()
+        if overdrawn or full_update:
+            pygame.display.update()
+        else:
+            pygame.display.update(changed_rects + UI_RECTS)
+        full_update = overdrawn
+
+        # Cap the frame rate when events arrive faster (e.g. mouse motion)
+        clock.tick(FPS)
+
+    # Clean up and exit
+    if analysis_executor is not None:
+        analysis_executor.shutdown(cancel_futures=True)
+    pygame.quit()
\ No newline at end of file
@@ -10,10 +10,119 @@ This module contains implementations of various pathfinding algorithms:
 
 Each algorithm is implemented to work step-by-step for visualization purposes.
 """
-from enums import Algorithm, GridState, Cell
-from collections import deque
+from enums import Algorithm, GridState
+from array import array
+import hashlib
 import heapq
+import itertools
 from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+import os
+import numpy as np
+from search_numba import NUMBA_AVAILABLE, bidirectional_bfs_nb, dfs_nb, greedy_bfs_nb, a_star_nb
+
+# Compiled run-to-completion implementations (Beam Search has none yet)
+# NOTE: Both endpoints are known when running to completion, so BFS searches
+# from both ends at once. It finds a path of the same length while visiting fewer cells.
+COMPILED_SEARCHES = {
+    Algorithm.BFS: bidirectional_bfs_nb,
+    Algorithm.DFS: dfs_nb,
+    Algorithm.GREEDY_BFS: greedy_bfs_nb,
+    Algorithm.A_STAR: a_star_nb,
+}
+UNSCORED = 2**31 - 1 # g_score of cells no path has been found to yet
+# 1 for the states a search can still move into (UNEXPLORED and GOAL), indexed by state value
+# NOTE: Their values aren't adjacent and can't be renumbered (saved mazes store them), so
+# a lookup replaces comparing against both.
+IS_OPEN = bytes(value in (GridState.UNEXPLORED, GridState.GOAL) for value in range(256))
+
+def _expand_layer_np(neighbors: np.ndarray, passable: np.ndarray, frontier: np.ndarray, dist: np.ndarray,
+                     parents: np.ndarray, other_dist: np.ndarray) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Expand one whole BFS layer for one side of bidirectional_bfs_np.
+    
+    The layer is expanded with a single gather from the neighbor table, keeping
+    the first time each cell is reached so cells are found in the same order
+    as in bidirectional_bfs_nb.
+    
+    Returns:
+        tuple: (frontier, found, meet) - the next layer, the cells of it the
+        other side hasn't reached (in the order they were found) and the
+        meeting point on the shortest path through this layer, or -1.
+    """
+    candidates = neighbors[frontier].reshape(-1)
+    sources = np.repeat(frontier, 4)
+    reached = candidates != -1
+    candidates, sources = candidates[reached], sources[reached]
+    reached = passable[candidates] & (dist[candidates] == -1)
+    candidates, sources = candidates[reached], sources[reached]
+    # Keep the first time each cell is reached, in the order it was reached
+    _, first = np.unique(candidates, return_index=True)
+    first.sort()
+    next_frontier = candidates[first]
+    parents[next_frontier] = sources[first]
+    dist[next_frontier] = dist[frontier[0]] + 1
+
+    met = other_dist[next_frontier] != -1
+    if not met.any():
+        return next_frontier, next_frontier, -1
+    meeting = next_frontier[met]
+    # NOTE: argmin keeps the first of equally short meetings, like the compiled search
+    meet = int(meeting[np.argmin(other_dist[meeting])])
+    return next_frontier, next_frontier[~met], meet
+
+def bidirectional_bfs_np(state: np.ndarray, neighbors: np.ndarray, start: int, goal: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bidirectional Breadth-First Search run to completion, one layer at a time with NumPy.
+    
+    Used in place of bidirectional_bfs_nb when Numba isn't available, visiting
+    the same cells in the same order: one BFS runs forward from the start and
+    one backward from the goal, expanding a whole layer of the smaller frontier
+    at a time until they meet.
+    
+    Args:
+        state (np.ndarray): size x size uint8 array of GridState values.
+        neighbors (np.ndarray): (size * size, 4) int32 neighbor table, -1 where off the grid.
+        start (int): Flattened index of the start cell.
+        goal (int): Flattened index of the goal cell.
+        
+    Returns:
+        tuple: (parents, order) - int32 ancestor index of every cell (-1 if none)
+        and the flattened indices of visited cells in visit order.
+    """
+    passable = np.frombuffer(IS_OPEN, dtype=bool)[state.reshape(-1)]
+    passable[start] = True
+    parents = np.full(state.size, -1, dtype=np.int32)
+    back_parents = np.full(state.size, -1, dtype=np.int32)
+    dist = np.full(state.size, -1, dtype=np.int32)
+    back_dist = np.full(state.size, -1, dtype=np.int32)
+    dist[start] = back_dist[goal] = 0
+    frontier = np.array([start], dtype=np.int32)
+    back_frontier = np.array([goal], dtype=np.int32)
+    layers = []
+    meet = -1
+
+    while meet == -1 and frontier.size and back_frontier.size:
+        if frontier.size <= back_frontier.size:
+            frontier, found, meet = _expand_layer_np(neighbors, passable, frontier, dist, parents, back_dist)
+        else:
+            back_frontier, found, meet = _expand_layer_np(neighbors, passable, back_frontier, back_dist, back_parents, dist)
+        layers.append(found)
+    if meet == -1:
+        return parents, np.concatenate(layers) if layers else np.empty(0, dtype=np.int32) # No solution found
+
+    # Point the backward half of the path from the meeting point towards the start
+    current = meet
+    while current != goal:
+        parents[back_parents[current]] = current
+        current = int(back_parents[current])
+    layers.append(np.array([goal], dtype=np.int32))
+    return parents, np.concatenate(layers)
+
+# Vectorized run-to-completion implementations used when Numba isn't available
+VECTORIZED_SEARCHES = {
+    Algorithm.BFS: bidirectional_bfs_np,
+}
 
 class SearchManager:
     """
@@ -25,19 +134,51 @@ class SearchManager:
     
     Attributes:
         size (int): The size of the grid (size x size).
-        grid (list): 2D grid of Cell objects representing the search space.
-        bfs_queue (deque): Queue used for BFS algorithm.
-        dfs_stack (list): Stack used for DFS algorithm.
+        state (np.ndarray): size x size uint8 array of GridState values.
+        flat_state (np.ndarray): Flattened view of state, indexed by x * size + y.
+        ancestor (np.ndarray): Flat int32 array holding the flattened index
+            (x * size + y) of each cell's ancestor, or -1 if it has none.
+        neighbors (np.ndarray): (size * size, 4) int32 table of each cell's neighbor
+            indices (up, right, down, left), -1 where the neighbor is off the grid.
+        bfs_queue (array): Queue used for BFS algorithm. Holds flattened cell
+            indices in a fixed buffer of size * size, read from bfs_head and
+            written at bfs_tail (every cell is queued at most once).
+        bfs_head (int): Index of the next cell to pop from bfs_queue.
+        bfs_tail (int): Index the next cell is pushed to in bfs_queue.
+        bfs_queued (bytearray): 1 for every cell that has been added to bfs_queue.
+        unqueued (bytes): All zero bytes, copied over bfs_queued on reset.
+        dfs_stack (list): Stack of flattened cell indices used for DFS algorithm. May hold
+            stale entries for cells that were moved to the top, which are skipped when popped.
         a_star_queue (list): Priority queue used for A* algorithm.
         greedy_bfs_queue (list): Priority queue used for Greedy BFS algorithm.
+        g_score (array): Flat int array of the best known path cost from the start
+            to each cell, UNSCORED if none was found yet (used by A* and Greedy BFS).
+        unscored (array): Flat int array of UNSCORED, copied over g_score on reset.
+        heap_counter (itertools.count): Insertion counter used to break priority ties.
+        held_entry (tuple): Best entry found by the last best-first step, kept out of
+            the heap so the next pop can push and pop it in one heappushpop, or None.
         beam_size (int): Maximum number of paths to explore in Beam Search.
-        beam_queue (list): Priority queue used for Beam Search algorithm.
+        beam_queue (list): Cells of the beam layer being explored by Beam Search,
+            best last so they are popped first.
+        beam_children (dict): Cells found from the current beam layer, keyed by
+            flattened index. The best beam_size of them become the next layer.
         goal_pos (tuple): (x, y) coordinates of the goal position.
+        goal_distance (list): Heuristic (Manhattan distance to the goal) of every
+            cell by flattened index, tabulated by set_goal.
         start_pos (tuple): (x, y) coordinates of the start position.
         path_started (bool): Flag indicating if search has started.
         last_explored (tuple): (x, y) coordinates of the last explored cell.
         finished (bool): Flag indicating if search has finished.
         cells_visited (int): Counter for number of cells visited during search.
+        path_length (int): Number of steps in the path found, set by colorPath.
+        dirty_cells (set): Flattened indices of cells changed since the last render.
+        selected_algo (Algorithm): Algorithm currently chosen in the UI, cached so
+            the play loop doesn't have to query the dropdown every step.
+        steppers (dict): Maps each Algorithm to the method that runs one step of it.
+        step (callable): Runs one step of selected_algo, bound when it is selected
+            so stepping doesn't branch on the algorithm.
+        analysis_cache (dict): Algorithm comparison results keyed by analysis_key(),
+            cleared whenever the maze is edited.
     """
     def __init__(self, _size=10, _beam_size=3):
         """
@@ -48,29 +189,67 @@ class SearchManager:
             _beam_size (int): Number of paths to keep for beam search.
         """
         self.size = _size
-        self.grid = [[Cell() for _ in range(self.size)] for _ in range(self.size)]
+        self.state = np.full((self.size, self.size), GridState.UNEXPLORED, dtype=np.uint8)
+        self.flat_state = self.state.reshape(-1)
+        self.ancestor = np.full(self.size * self.size, -1, dtype=np.int32)
+        self.neighbors = np.full((self.size * self.size, 4), -1, dtype=np.int32)
+        for x in range(self.size):
+            for y in range(self.size):
+                for direction, (i, j) in enumerate([(-1,0), (0,1), (1,0), (0,-1)]):
+                    if 0 <= x + i < self.size and 0 <= y + j < self.size:
+                        self.neighbors[x * self.size + y, direction] = (x + i) * self.size + y + j
 
         # BFS
-        self.bfs_queue = deque()
+        self.bfs_queue = array('i', bytes(4 * self.size * self.size))
+        self.bfs_head = self.bfs_tail = 0
+        self.bfs_queued = bytearray(self.size * self.size)
+        self.unqueued = bytes(self.size * self.size)
         # DFS
         self.dfs_stack = []
         # A*
         self.a_star_queue = []
-        heapq.heapify(self.a_star_queue)
         # Greedy BFS
         self.greedy_bfs_queue = []
-        heapq.heapify(self.greedy_bfs_queue)
+        # Shared by A* and Greedy BFS
+        self.unscored = array('i', [UNSCORED]) * (self.size * self.size)
+        self.g_score = array('i', self.unscored)
+        self.heap_counter = itertools.count()
+        self.held_entry = None
         # Beam
         self.beam_size = _beam_size
         self.beam_queue = []
-        heapq.heapify(self.beam_queue)
+        self.beam_children = {}
 
         self.goal_pos = None
+        self.goal_distance = None
         self.start_pos = None
         self.path_started = False
         self.last_explored = None
         self.finished = False
         self.cells_visited = 0
+        self.path_length = 0
+        self.steppers = {
+            Algorithm.BFS: self.bfs,
+            Algorithm.DFS: self.dfs,
+            Algorithm.GREEDY_BFS: self.greedy_bfs,
+            Algorithm.A_STAR: self.a_star,
+            Algorithm.BEAM: lambda: self.beam(self.beam_size),
+        }
+        self.selected_algo = None
+        self.step = lambda: None # Nothing selected yet
+        self.analysis_cache = {}
+        # Every cell needs painting on the first render
+        self.dirty_cells = set(range(self.size * self.size))
+
+    def select_algorithm(self, algo: Algorithm):
+        """
+        Record the algorithm chosen in the UI and bind its stepper to step.
+        
+        Args:
+            algo (Algorithm): The selected algorithm, or None if nothing is selected.
+        """
+        self.selected_algo = algo
+        self.step = self.steppers.get(algo, lambda: None)
 
     def search(self, algo: Algorithm):
         """
@@ -79,36 +258,26 @@ class SearchManager:
         Args:
             algo (Algorithm): The algorithm to use for search.
         """
-        match algo:
-            case Algorithm.BFS:
-                self.bfs()
-            case Algorithm.DFS:
-                self.dfs()
-            case Algorithm.GREEDY_BFS:
-                self.greedy_bfs()
-            case Algorithm.A_STAR:
-                self.a_star()
-            case Algorithm.BEAM:
-                self.beam(self.beam_size)
+        self.steppers[algo]()
     
     def reset_grid(self):
         """
         Reset the grid to its initial state while preserving obstacles, start, and goal.
         
-        This method clears all search-related cell states (SEEN, PATH) but preserves the
-        obstacles, start, and goal positions.
+        This method clears all search-related cell states (SEEN, CURRENT, PATH) but
+        preserves the obstacles, start, and goal positions. Only the cleared cells
+        are marked dirty.
         """
-        self.grid = [[Cell(self.grid[x][y].gridState) if self.grid[x][y].gridState != GridState.SEEN and self.grid[x][y].gridState != GridState.PATH else Cell() for y in range(self.size)] for x in range(self.size)]
-        # reset the last seen (important if the goal was not reached)
-        if self.last_explored:
-            last_x, last_y = self.last_explored
-            self.grid[last_x][last_y] = Cell()        
+        flat_state = self.flat_state
+        touched = np.flatnonzero((flat_state == GridState.SEEN) | (flat_state == GridState.CURRENT) | (flat_state == GridState.PATH))
+        flat_state[touched] = GridState.UNEXPLORED
+        self.ancestor.fill(-1)
         # reset state of goal incase it was reached
         if self.goal_pos:
-            goal_x, goal_y = self.goal_pos
-            self.grid[goal_x][goal_y] = Cell(GridState.GOAL)
+            self.state[self.goal_pos] = GridState.GOAL
         # NOTE: If the last explored was the goal, the goal will still be properly colored
         # because we set the goal after
+        self.dirty_cells.update(touched.tolist())
 
     def reset(self):
         """
@@ -123,16 +292,73 @@ class SearchManager:
         self.last_explored = None
         self.finished = False
         self.cells_visited = 0
-        self.bfs_queue = deque()
-        self.greedy_bfs_queue = []
-        heapq.heapify(self.greedy_bfs_queue)
-        self.dfs_stack = []
-        self.a_star_queue = []
-        heapq.heapify(self.a_star_queue)
-        self.beam_queue = []
-        heapq.heapify(self.beam_queue)
+        self.path_length = 0
+        self.bfs_head = self.bfs_tail = 0
+        # NOTE: Everything is cleared in place, an empty list is already a heap
+        self.bfs_queued[:] = self.unqueued
+        self.greedy_bfs_queue.clear()
+        self.dfs_stack.clear()
+        self.a_star_queue.clear()
+        self.g_score[:] = self.unscored
+        self.heap_counter = itertools.count()
+        self.held_entry = None
+        self.beam_queue.clear()
+        self.beam_children.clear()
 
 
+    def index(self, pos: tuple[int, int]) -> int:
+        """
+        Convert a position to its index in the flattened grid.
+        
+        Args:
+            pos (tuple): (x, y) coordinates of the cell.
+            
+        Returns:
+            int: The flattened index x * size + y.
+        """
+        return pos[0] * self.size + pos[1]
+
+    def mark_dirty(self, pos: tuple[int, int]):
+        """
+        Flag a cell as changed so the renderer repaints it.
+        
+        Args:
+            pos (tuple): (x, y) coordinates of the changed cell.
+        """
+        self.dirty_cells.add(pos[0] * self.size + pos[1])
+
+    def take_dirty_cells(self) -> set[int]:
+        """
+        Hand the set of changed cells to the renderer and start a new one.
+        
+        The set is swapped rather than copied and cleared, so the renderer can
+        keep the returned batch while new changes are marked.
+        
+        Returns:
+            set: Flattened indices of cells changed since the last call.
+        """
+        dirty = self.dirty_cells
+        self.dirty_cells = set()
+        return dirty
+
+    def toggle_obstacle(self, pos: tuple[int, int]):
+        """
+        Toggle an obstacle at the given position.
+        
+        Only unexplored cells can become obstacles; anything else is left alone.
+        
+        Args:
+            pos (tuple): (x, y) coordinates of the cell to toggle.
+        """
+        if self.state[pos] == GridState.UNEXPLORED:
+            self.state[pos] = GridState.OBSTACLE
+        elif self.state[pos] == GridState.OBSTACLE:
+            self.state[pos] = GridState.UNEXPLORED
+        else:
+            return
+        self.mark_dirty(pos)
+        self.analysis_cache.clear()
+
     def set_goal(self, goal: tuple[int, int]):
         """
         Set the goal position on the grid.
@@ -141,10 +367,15 @@ class SearchManager:
             goal (tuple): (x, y) coordinates for the goal position.
         """
         if self.goal_pos is not None:
-            old_x, old_y = self.goal_pos
-            self.grid[old_x][old_y].gridState = GridState.UNEXPLORED
+            self.state[self.goal_pos] = GridState.UNEXPLORED
+            self.mark_dirty(self.goal_pos)
         self.goal_pos = goal
-        self.grid[goal[0]][goal[1]].gridState = GridState.GOAL
+        rows = np.abs(np.arange(self.size) - goal[0])
+        cols = np.abs(np.arange(self.size) - goal[1])
+        self.goal_distance = (rows[:, None] + cols[None, :]).ravel().tolist()
+        self.state[goal] = GridState.GOAL
+        self.mark_dirty(goal)
+        self.analysis_cache.clear()
 
     def set_start(self, start: tuple[int, int]):
         """
@@ -159,10 +390,12 @@ class SearchManager:
         if self.path_started:
             self.reset()
         if self.start_pos is not None:
-            old_x, old_y = self.start_pos
-            self.grid[old_x][old_y].gridState = GridState.UNEXPLORED
+            self.state[self.start_pos] = GridState.UNEXPLORED
+            self.mark_dirty(self.start_pos)
         self.start_pos = start
-        self.grid[start[0]][start[1]].gridState = GridState.START
+        self.state[start] = GridState.START
+        self.mark_dirty(start)
+        self.analysis_cache.clear()
     
     # ALGO IMPLEMENTATIONS
     # NOTE: All functions will perform 1 step (explore one unit) to make the program intractable
@@ -174,12 +407,36 @@ class SearchManager:
         
         Searches all paths at the same time, expanding each path equally one step at a time.
         This ensures the shortest path (in terms of steps) is found.
+        
+        NOTE: Cells are queued as flattened indices and bfs_queued replaces
+        scanning the queue to check if a neighbor is already in it.
         """
-        self.search_impl(
-            self.bfs_queue,
-            lambda: self.bfs_queue.popleft(),
-            lambda current: self.bfs_queue.append(current)
-        )
+        if not self.explore_next(self.bfs_pop):
+            return
+
+        last_index = self.index(self.last_explored)
+        flat_state, queued, queue, ancestor = self.flat_state, self.bfs_queued, self.bfs_queue, self.ancestor
+        tail = self.bfs_tail
+        for neighbor in self.neighbors[last_index].tolist():
+            if neighbor != -1 and not queued[neighbor] and IS_OPEN[flat_state[neighbor]]:
+                queued[neighbor] = 1
+                queue[tail] = neighbor
+                tail += 1
+                ancestor[neighbor] = last_index
+        self.bfs_tail = tail
+
+    def bfs_pop(self) -> tuple[int, int] | None:
+        """
+        Pop the next cell off the BFS queue.
+        
+        Returns:
+            tuple or None: (x, y) coordinates of the cell, or None if the queue is empty.
+        """
+        if self.bfs_head == self.bfs_tail:
+            return None
+        index = self.bfs_queue[self.bfs_head]
+        self.bfs_head += 1
+        return divmod(index, self.size)
 
     def dfs(self):
         """
@@ -187,32 +444,39 @@ class SearchManager:
         
         Explores one path fully before backtracking to explore alternate paths.
         May not find the shortest path, but can be more memory efficient than BFS.
+        
+        Neighbors already on the stack are moved to the top, so they are explored
+        from the most recent cell that found them.
         """
-        self.search_impl(
-            self.dfs_stack,
-            lambda: self.dfs_stack.pop(),
-            lambda current: self.dfs_stack.append(current),
-            self.dfs_handle_existing_neighbor
-        )
-    
-    def dfs_handle_existing_neighbor(self, current):
+        if not self.explore_next(self.dfs_pop):
+            return
+
+        last_index = self.index(self.last_explored)
+        flat_state, ancestor = self.flat_state, self.ancestor
+        push = self.dfs_stack.append
+        for neighbor in self.neighbors[last_index].tolist():
+            if neighbor != -1 and IS_OPEN[flat_state[neighbor]]:
+                # NOTE: A neighbor already on the stack is pushed again rather than moved
+                # (an O(n) removal). dfs_pop skips the old entry, as the cell will have
+                # been explored by the time it is reached.
+                push(neighbor)
+                # set the ancestor to the last explored node
+                # this is important to ensure the path is correct
+                ancestor[neighbor] = last_index
+
+    def dfs_pop(self) -> tuple[int, int] | None:
         """
-        Special handler for DFS to manage neighbors already in the stack.
+        Pop the next cell off the DFS stack, skipping stale entries.
         
-        When DFS encounters a neighbor already in the stack, this method ensures
-        the path consistency by updating the ancestor relationship.
-        
-        Args:
-            current (tuple): (x, y) coordinates of the neighbor cell.
-        """
-        # remove the current node from the stack
-        self.dfs_stack.remove(current)
-        # add it to the end of the stack
-        self.dfs_stack.append(current)
-        # set the ancestor to the last explored node
-        # this is important to ensure the path is correct
-        x, y = current
-        self.grid[x][y].ancestor = self.last_explored
+        Returns:
+            tuple or None: (x, y) coordinates of the cell, or None if only
+            stale entries were left.
+        """
+        while self.dfs_stack:
+            index = self.dfs_stack.pop()
+            if IS_OPEN[self.flat_state[index]]:
+                return divmod(index, self.size)
+        return None
 
     # Informed
     def a_star(self):
@@ -223,11 +487,7 @@ class SearchManager:
         cost to the goal. This generally finds the optimal path while exploring fewer
         nodes than BFS.
         """
-        self.search_impl(
-            self.a_star_queue,
-            lambda: heapq.heappop(self.a_star_queue)[1],
-            lambda current: heapq.heappush(self.a_star_queue, (self.heuristic(current) + self.pathLength(self.last_explored), current))
-        )
+        self.best_first_step(self.a_star_queue, use_cost=True)
         
     def greedy_bfs(self):
         """
@@ -236,11 +496,7 @@ class SearchManager:
         Prioritizes paths that appear to be closest to the goal according to a heuristic.
         Fast but may not find the optimal path.
         """
-        self.search_impl(
-            self.greedy_bfs_queue,
-            lambda: heapq.heappop(self.greedy_bfs_queue)[1],
-            lambda current: heapq.heappush(self.greedy_bfs_queue, (self.heuristic(current), current))
-        )
+        self.best_first_step(self.greedy_bfs_queue, use_cost=False)
 
     def beam(self, n):
         """
@@ -249,13 +505,49 @@ class SearchManager:
         Similar to breadth-first search but only keeps the best n paths at each step.
         This limits memory usage but may miss the optimal solution.
         
+        Each step explores one cell of the current layer, collecting its
+        neighbors. Once the layer is used up, the n children closest to the
+        goal become the next layer and the rest are dropped (they were never
+        marked, so they can still be reached later).
+        
         Args:
             n (int): The beam width - number of paths to maintain at each step.
         """
-        pass
+        if not self.explore_next(lambda: self.beam_pop(n)):
+            return
+
+        last_index = self.index(self.last_explored)
+        flat_state, size = self.flat_state, self.size
+        for neighbor in self.neighbors[last_index].tolist():
+            if neighbor != -1 and IS_OPEN[flat_state[neighbor]] and neighbor not in self.beam_children:
+                self.beam_children[neighbor] = divmod(neighbor, size)
+                self.ancestor[neighbor] = last_index
+
+    def beam_pop(self, n: int) -> tuple[int, int] | None:
+        """
+        Pop the next cell of the beam, moving on to the next layer (the n best
+        children) when the current one is used up.
+        
+        Args:
+            n (int): The beam width.
+            
+        Returns:
+            tuple or None: (x, y) coordinates of the cell, or None if there
+            are no cells left to explore.
+        """
+        while True:
+            while self.beam_queue:
+                pos = self.beam_queue.pop()
+                if IS_OPEN[self.state[pos]]:
+                    return pos
+            if not self.beam_children:
+                return None
+            survivors = heapq.nsmallest(n, self.beam_children, key=self.goal_distance.__getitem__)
+            self.beam_queue = [self.beam_children[index] for index in reversed(survivors)]
+            self.beam_children = {}
 
     # Algo Helper Functions
-    def explore_next(self, data, get_next: Callable[[], tuple[int,int]]) -> bool:
+    def explore_next(self, get_next: Callable[[], tuple[int,int] | None]) -> bool:
         """
         Helper function for exploring the next cell in a search algorithm.
         
@@ -263,8 +555,8 @@ class SearchManager:
         the goal, and advancing the search state.
         
         Args:
-            data: The data structure containing cells to explore (queue, stack, etc.)
-            get_next: Function that returns the next cell to explore from the data structure.
+            get_next: Function that returns the next cell to explore from the data
+                structure (queue, stack, etc.), or None if it has no cells left.
             
         Returns:
             bool: True if search should continue, False if search is complete or impossible.
@@ -275,138 +567,146 @@ class SearchManager:
             self.last_explored = self.start_pos
             self.path_started = True
         else:
+            state, last_explored = self.state, self.last_explored
             # Unset last seen
-            if self.last_explored != self.start_pos:
-                x, y = self.last_explored
-                self.grid[x][y].gridState = GridState.SEEN
+            if last_explored != self.start_pos:
+                state[last_explored] = GridState.SEEN
+                self.mark_dirty(last_explored)
 
             # Color and set new current
-            if len(data) < 1:
-                return False # No solution found (May not be possible)
-            self.last_explored = get_next()
-            x, y = self.last_explored
-            self.grid[x][y].gridState = GridState.CURRENT
+            while True:
+                next_pos = get_next()
+                if next_pos is None:
+                    return False # No solution found (May not be possible)
+                # If the user adds obstacles after a cell has been added to the
+                # data structure for next options to explore we need to skip that node.
+                if state[next_pos] != GridState.OBSTACLE:
+                    break
+            self.last_explored = next_pos
+            state[next_pos] = GridState.CURRENT
+            self.mark_dirty(next_pos)
             self.cells_visited += 1
 
-            if self.last_explored == self.goal_pos:
+            if next_pos == self.goal_pos:
                 print(f"GOAL REACHED! Cells visited: {self.cells_visited}")
                 self.colorPath()
                 self.finished = True
                 return False
         
-        # If the user adds obstacles after a cell has been added to the
-        # data structure for next options to explore we need to skip that node.
-        x, y = self.last_explored
-        if self.grid[x][y].gridState == GridState.OBSTACLE:
-            return self.explore_next(data, get_next)
-        
         return True
     
-    def add_neighbors(self, next_options, add: Callable[[tuple[int,int]], None], handleExistingNeighbor: Callable[[tuple[int,int]], None]=lambda current: None):
+    def best_first_step(self, queue: list, use_cost: bool):
         """
-        Add valid neighboring cells to the search data structure.
+        One step of a best-first search (A* or Greedy BFS) on a heap of
+        (priority, counter, flattened index) entries.
+        
+        A neighbor is pushed when it is first discovered or when a cheaper path
+        to it is found. Rather than updating the old entry (decrease-key), the
+        outdated one is left in the heap and skipped when popped.
+        
+        A* priorities are g + h * (1 + 1/size²), which breaks ties between equal
+        f values in favor of cells closer to the goal. Since h / size² < 1 the
+        path found is still optimal. They are stored multiplied by size² so
+        they stay integers.
         
-        Checks the four adjacent cells (up, right, down, left) and adds valid ones
-        to the data structure for future exploration.
-        NOTE: This assumes all neighbors are explored. Algorithms like beam search only search beam_size many neighbors.
-
         Args:
-            next_options: Data structure containing cells to explore.
-            add: Function to add a cell to the data structure.
-            handleExistingNeighbor: Optional function to handle neighbors already in the data structure.
-        """
-        x, y = self.last_explored
-
-        for i,j in [(-1,0), (0,1), (1,0), (0,-1)]:
-            current_x, current_y = x + i, y + j
-            current = (current_x, current_y)
-
-            if 0 <= current_x < self.size and 0 <= current_y < self.size and (self.grid[current_x][current_y].gridState == GridState.UNEXPLORED or self.grid[current_x][current_y].gridState == GridState.GOAL):
-                # check if cell is in queue
-                in_next = False
-                for cell in next_options:
-                    if cell == current:
-                        in_next = True
-                        break
-                if not in_next:
-                    add(current)
-                    self.grid[current_x][current_y].ancestor = self.last_explored
+            queue (list): The heap to search with.
+            use_cost (bool): Add the path cost so far to the heuristic (A*), or
+                prioritize by the heuristic alone (Greedy BFS).
+        """
+        if not self.explore_next(lambda: self.best_first_pop(queue)):
+            return
+
+        last_index = self.index(self.last_explored)
+        flat_state, g_score, goal_distance = self.flat_state, self.g_score, self.goal_distance
+        cells = self.size * self.size
+        if self.last_explored == self.start_pos:
+            g_score[last_index] = 0
+        g = g_score[last_index] + 1
+
+        ancestor, counter, heappush = self.ancestor, self.heap_counter, heapq.heappush
+        held = None
+        for neighbor in self.neighbors[last_index].tolist():
+            if neighbor != -1 and IS_OPEN[flat_state[neighbor]] and g < g_score[neighbor]:
+                g_score[neighbor] = g
+                ancestor[neighbor] = last_index
+                priority = g * cells + goal_distance[neighbor] * (cells + 1) if use_cost else goal_distance[neighbor]
+                entry = (priority, next(counter), neighbor)
+                # Hold back the best entry, it is the most likely to be popped next
+                if held is None:
+                    held = entry
+                elif entry < held:
+                    heappush(queue, held)
+                    held = entry
                 else:
-                    handleExistingNeighbor(current)
+                    heappush(queue, entry)
+        self.held_entry = held
 
-    def search_impl(self, data, get_next: Callable[[], tuple[int,int]], add: Callable[[tuple[int,int]], None], handleExistingNeighbor: Callable[[tuple[int,int]], None]=lambda current: None):
+    def best_first_pop(self, queue: list) -> tuple[int, int] | None:
         """
-        Generic search implementation that can be configured for different algorithms.
+        Pop the best cell from a best-first search heap, skipping stale entries.
         
-        This is the core search function used by all the algorithms. It's customized
-        through function parameters to implement specific search behaviors.
+        An entry is stale if its cell was already explored through a cheaper
+        entry (or has been made an obstacle since it was pushed). The entry held
+        back by best_first_step is pushed in the same heappushpop as the pop.
         
         Args:
-            data: The data structure to use (queue, stack, heap, etc.)
-            get_next: Function to get the next cell from the data structure.
-            add: Function to add a cell to the data structure.
-            handleExistingNeighbor: Function to handle neighbors already in data structure.
-        """
-        if not self.explore_next(data, get_next):
-            return
-
-        self.add_neighbors(data, add, handleExistingNeighbor)
+            queue (list): The heap to pop from.
+            
+        Returns:
+            tuple or None: (x, y) coordinates of the next cell, or None if only
+            stale entries were left.
+        """
+        entry, self.held_entry = self.held_entry, None
+        while entry is not None or queue:
+            # NOTE: heappushpop returns the held entry right away if it beats the heap
+            _, _, index = heapq.heappushpop(queue, entry) if entry is not None else heapq.heappop(queue)
+            entry = None
+            if IS_OPEN[self.flat_state[index]]:
+                return divmod(index, self.size)
+        return None
 
     def colorPath(self):
         """
         Highlight the path from start to goal once goal is reached.
         
         Traces back from the goal to the start using ancestor pointers and
-        updates the cell state to PATH for visualization.
+        updates the cell state to PATH for visualization. The number of steps
+        walked is kept in path_length.
         """
-        cell_pos = self.grid[self.last_explored[0]][self.last_explored[1]].ancestor
+        start_index = self.index(self.start_pos)
+        index = self.ancestor[self.index(self.last_explored)]
+        self.path_length = 1 # The step into the goal
 
-        while self.start_pos != cell_pos:
-            x, y = cell_pos
-            cell = self.grid[x][y]
-            cell.gridState = GridState.PATH
-            cell_pos = cell.ancestor
-
-    def pathLength(self, pos):
-        """
-        Calculate the path length from the start to the given position.
-        
-        Args:
-            pos (tuple): (x, y) coordinates of the end position.
-            
-        Returns:
-            int: The number of steps in the path.
-        """
-        count = 0
-        while pos != self.start_pos:
-            count += 1
-            pos = self.grid[pos[0]][pos[1]].ancestor
-        return count
+        while index != start_index:
+            self.flat_state[index] = GridState.PATH
+            self.dirty_cells.add(int(index))
+            index = self.ancestor[index]
+            self.path_length += 1
 
-    def heuristic(self, pos):
+    def analysis_key(self) -> bytes:
         """
-        Calculate a heuristic estimate of distance from position to goal.
+        Hash the maze (cell states plus start and goal) for caching analysis results.
         
-        Uses Euclidean distance as the heuristic function.
-        
-        Args:
-            pos (tuple): (x, y) coordinates of the position.
-            
         Returns:
-            float: The estimated distance to the goal.
+            bytes: 8 byte blake2b digest identifying the maze.
         """
-        cur_x, cur_y = pos
-        goal_x, goal_y = self.goal_pos
-        return ((goal_x-cur_x)**2+(goal_y-cur_y)**2)**0.5
+        positions = np.array([self.start_pos or (-1, -1), self.goal_pos or (-1, -1)], dtype=np.int32)
+        return hashlib.blake2b(self.state.tobytes() + positions.tobytes(), digest_size=8).digest()
 
-    def run_algorithm_to_completion(self, algo: Algorithm):
+    def run_algorithm_to_completion(self, algo: Algorithm, step_size: int = 32):
         """
         Run a search algorithm until it reaches the goal or exhausts all options.
         
         Used for analysis to compare performance metrics of different algorithms.
+        When Numba is available the compiled implementation from search_numba
+        is used, otherwise the NumPy one from VECTORIZED_SEARCHES if there is one,
+        or else the step-by-step implementation is run in a loop.
         
         Args:
             algo (Algorithm): The algorithm to run.
+            step_size (int): Number of steps run between checks for whether the
+                step-by-step search has finished or stopped making progress.
             
         Returns:
             dict: Performance metrics including cells visited and path length.
@@ -414,28 +714,123 @@ class SearchManager:
         # Reset everything first
         self.reset()
         
-        # Keep searching until finished or no more cells to explore
-        steps = 0
-        max_steps = self.size ** 2 * 2  # Avoid infinite loops
-        
-        while not self.finished and steps < max_steps:
-            self.search(algo)
-            steps += 1
+        fast_search = (COMPILED_SEARCHES if NUMBA_AVAILABLE else VECTORIZED_SEARCHES).get(algo)
+        if fast_search and self.start_pos is not None and self.goal_pos is not None:
+            parents, order = fast_search(self.state, self.neighbors, self.index(self.start_pos), self.index(self.goal_pos))
+            self.apply_search_result(parents, order)
+        else:
+            # Keep searching until finished or no more cells to explore
+            step = self.steppers[algo]
+            steps = 0
+            max_steps = self.size ** 2 * 2  # Avoid infinite loops
             
-            # If no progress can be made (no more cells to explore)
-            if steps > 0 and not self.path_started:
-                break
+            while not self.finished and steps < max_steps:
+                progress = (self.path_started, self.cells_visited)
+                for _ in range(step_size):
+                    step()
+                steps += step_size
+                
+                # NOTE: Every step starts the search or visits a cell unless there are none
+                # left, so a batch that did neither means no progress can be made
+                if not self.finished and (self.path_started, self.cells_visited) == progress:
+                    break
         
         # Return the metrics
-        path_length = 0
-        if self.finished:
-            path_length = self.pathLength(self.goal_pos)
-            
         return {
             "algorithm": algo.value,
             "cells_visited": self.cells_visited,
-            "path_length": path_length,
+            "path_length": self.path_length,
             "goal_reached": self.finished
         }
 
+    def apply_search_result(self, parents: np.ndarray, order: np.ndarray):
+        """
+        Load the outcome of a compiled search into the grid.
+        
+        Leaves the grid and counters as if the search had been stepped to the
+        same point: visited cells SEEN, the last one CURRENT and, if the goal
+        was reached, the path colored.
+        
+        Args:
+            parents (np.ndarray): Flat int32 ancestor index of every cell.
+            order (np.ndarray): Flattened indices of visited cells in visit order.
+        """
+        self.ancestor[:] = parents
+        self.path_started = True
+        self.last_explored = self.start_pos
+        self.cells_visited = len(order)
+        self.dirty_cells.update(range(self.size * self.size))
+        if len(order) == 0:
+            return
+        
+        self.state.flat[order] = GridState.SEEN
+        last_explored = divmod(int(order[-1]), self.size)
+        if last_explored == self.goal_pos:
+            self.last_explored = last_explored
+            self.state[last_explored] = GridState.CURRENT
+            print(f"GOAL REACHED! Cells visited: {self.cells_visited}")
+            self.colorPath()
+            self.finished = True
+
+def run_algorithm_on_snapshot(task: tuple[np.ndarray, tuple[int, int], tuple[int, int], Algorithm]) -> dict:
+    """
+    Run a search algorithm to completion on a copy of a maze.
+    
+    Defined at module level so it can be sent to worker processes, which
+    lets several algorithms be compared in parallel.
+    
+    Args:
+        task (tuple): (state, start, goal, algo) - the uint8 state array of the
+            maze, the start and goal positions, and the algorithm to run.
+            
+    Returns:
+        dict: Performance metrics from run_algorithm_to_completion.
+    """
+    state, start, goal, algo = task
+    manager = SearchManager(_size=len(state))
+    manager.state[:] = state
+    manager.set_start(start)
+    manager.set_goal(goal)
+    return manager.run_algorithm_to_completion(algo)
 
+def submit_comparison(executor: Executor, state: np.ndarray, start: tuple[int, int], goal: tuple[int, int],
+                      algos: list[Algorithm]) -> list[Future]:
+    """
+    Submit one run_algorithm_on_snapshot per algorithm to a process pool.
+    
+    Args:
+        executor (Executor): The pool to run the searches in.
+        state (np.ndarray): size x size uint8 array of GridState values.
+        start (tuple): (x, y) coordinates of the start position.
+        goal (tuple): (x, y) coordinates of the goal position.
+        algos (list): The algorithms to run.
+        
+    Returns:
+        list: Futures of the performance metrics, in the order of algos.
+    """
+    # NOTE: Tasks are pickled on a pool thread after submit returns, so they get a copy
+    # of the maze the caller can keep editing
+    snapshot = state.copy()
+    return [executor.submit(run_algorithm_on_snapshot, (snapshot, start, goal, algo)) for algo in algos]
+
+def compare_algorithms(state: np.ndarray, start: tuple[int, int], goal: tuple[int, int], algos: list[Algorithm]) -> dict:
+    """
+    Run several search algorithms to completion on a maze, each in its own process.
+    
+    A blocking helper for comparing algorithms outside the UI (the UI passes
+    its own pool to submit_comparison so the window keeps responding).
+    
+    Args:
+        state (np.ndarray): size x size uint8 array of GridState values.
+        start (tuple): (x, y) coordinates of the start position.
+        goal (tuple): (x, y) coordinates of the goal position.
+        algos (list): The algorithms to run.
+        
+    Returns:
+        dict: Performance metrics from run_algorithm_to_completion, keyed by Algorithm.
+    """
+    if not algos:
+        return {}
+    with ProcessPoolExecutor(max_workers=min(len(algos), os.cpu_count() or 1)) as executor:
+        futures = submit_comparison(executor, state, start, goal, algos)
+        return {algo: future.result() for algo, future in zip(algos, futures)}
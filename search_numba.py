@@ -0,0 +1,366 @@
+"""
+Compiled Search Module
+
+This module contains Numba-compiled versions of the pathfinding algorithms,
+used when a search is run to completion (e.g. for algorithm analysis) rather
+than stepped for visualization:
+- Breadth-First Search (BFS), bidirectional
+- Depth-First Search (DFS)
+- Greedy Best-First Search
+- A* Search
+
+Each function works on the uint8 state array, the neighbor table built by
+SearchManager and flattened cell indices (x * size + y), and returns what the
+step-by-step SearchManager builds up: the ancestor of every cell and the order
+in which cells were visited.
+
+Numba is optional. Without it NUMBA_AVAILABLE is False and SearchManager
+runs BFS with the NumPy bidirectional_bfs_np instead, and steps its Python
+implementations of the other searches.
+"""
+from enums import GridState
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function uncompiled."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Plain ints so compiled code treats them as constants
+UNEXPLORED = int(GridState.UNEXPLORED)
+GOAL = int(GridState.GOAL)
+
+# Helper Functions
+# Cell sets (visited, open, ...) are bitsets: one bit per cell packed into uint64 words
+@njit(cache=True)
+def _bitset(n):
+    """Create an empty bitset able to hold n cells."""
+    return np.zeros((n + 63) >> 6, np.uint64)
+
+@njit(cache=True)
+def _set_bit(bits, index):
+    """Add a cell to a bitset."""
+    bits[index >> 6] |= np.uint64(1) << np.uint64(index & 63)
+
+@njit(cache=True)
+def _clear_bit(bits, index):
+    """Remove a cell from a bitset."""
+    bits[index >> 6] &= ~(np.uint64(1) << np.uint64(index & 63))
+
+@njit(cache=True)
+def _test_bit(bits, index):
+    """Check whether a cell is in a bitset."""
+    return (bits[index >> 6] >> np.uint64(index & 63)) & np.uint64(1) != 0
+
+@njit(cache=True)
+def _open_cells(state):
+    """Bitset of cells that can be added to the frontier (unexplored or the goal)."""
+    flat_state = state.ravel()
+    bits = _bitset(flat_state.size)
+    for index in range(flat_state.size):
+        if flat_state[index] == UNEXPLORED or flat_state[index] == GOAL:
+            _set_bit(bits, index)
+    return bits
+
+@njit(cache=True)
+def _heuristic(index, goal, size):
+    """Manhattan distance from a cell to the goal (same as SearchManager.heuristic)."""
+    return abs(goal // size - index // size) + abs(goal % size - index % size)
+
+@njit(cache=True)
+def _heap_less(keys, counters, i, j):
+    """Order heap entries by key, breaking ties on insertion order like SearchManager's heap counter."""
+    return keys[i] < keys[j] or (keys[i] == keys[j] and counters[i] < counters[j])
+
+@njit(cache=True)
+def _heap_swap(keys, counters, nodes, i, j):
+    """Swap two heap entries."""
+    keys[i], keys[j] = keys[j], keys[i]
+    counters[i], counters[j] = counters[j], counters[i]
+    nodes[i], nodes[j] = nodes[j], nodes[i]
+
+@njit(cache=True)
+def _heap_push(keys, counters, nodes, length, key, counter, node):
+    """Push an entry onto a binary heap stored in preallocated arrays. Returns the new length."""
+    i = length
+    keys[i] = key
+    counters[i] = counter
+    nodes[i] = node
+    while i > 0:
+        parent = (i - 1) // 2
+        if not _heap_less(keys, counters, i, parent):
+            break
+        _heap_swap(keys, counters, nodes, i, parent)
+        i = parent
+    return length + 1
+
+@njit(cache=True)
+def _heap_pop(keys, counters, nodes, length):
+    """Pop the smallest node off a binary heap stored in preallocated arrays. Returns (node, new length)."""
+    top = nodes[0]
+    length -= 1
+    _heap_swap(keys, counters, nodes, 0, length)
+    i = 0
+    while True:
+        smallest = i
+        left, right = 2 * i + 1, 2 * i + 2
+        if left < length and _heap_less(keys, counters, left, smallest):
+            smallest = left
+        if right < length and _heap_less(keys, counters, right, smallest):
+            smallest = right
+        if smallest == i:
+            break
+        _heap_swap(keys, counters, nodes, i, smallest)
+        i = smallest
+    return top, length
+
+# ALGO IMPLEMENTATIONS
+# NOTE: All functions take (state, neighbors, start, goal) and return (parents, order)
+
+# Uninformed
+@njit(cache=True)
+def _expand_layer(neighbors, passable, queue, head, tail, dist, parents, other_dist, order, count, best, meet):
+    """
+    Expand one whole BFS layer for one side of bidirectional_bfs_nb.
+
+    Newly discovered cells are added to order unless the other side already
+    reached them, in which case they are a meeting point. The meeting point
+    with the shortest total path is kept.
+
+    Returns:
+        tuple: (head, tail, count, best, meet) after the layer.
+    """
+    end = tail
+    while head < end:
+        current = queue[head]
+        head += 1
+        for neighbor in neighbors[current]:
+            if neighbor != -1 and _test_bit(passable, neighbor) and dist[neighbor] == -1:
+                dist[neighbor] = dist[current] + 1
+                parents[neighbor] = current
+                queue[tail] = neighbor
+                tail += 1
+                if other_dist[neighbor] == -1:
+                    order[count] = neighbor
+                    count += 1
+                elif dist[neighbor] + other_dist[neighbor] < best:
+                    best = dist[neighbor] + other_dist[neighbor]
+                    meet = neighbor
+    return head, tail, count, best, meet
+
+@njit(cache=True)
+def bidirectional_bfs_nb(state, neighbors, start, goal):
+    """
+    Bidirectional Breadth-First Search run to completion.
+
+    Runs one BFS forward from the start and one backward from the goal,
+    expanding a whole layer of the smaller frontier at a time, until they
+    meet. On an open grid this reaches roughly half the cells a one-sided BFS
+    reaches. The layer in which the frontiers first meet is finished so the
+    meeting point on a shortest path is found.
+
+    The backward half of the path is re-linked into parents so it can be
+    traced from the goal like any other search. Visited cells are every cell
+    reached by either side, the goal coming last when it was reached.
+
+    Args:
+        state (np.ndarray): size x size uint8 array of GridState values.
+        neighbors (np.ndarray): (size * size, 4) int32 neighbor table, -1 where off the grid.
+        start (int): Flattened index of the start cell.
+        goal (int): Flattened index of the goal cell.
+
+    Returns:
+        tuple: (parents, order) - int32 ancestor index of every cell (-1 if none)
+        and the flattened indices of visited cells in visit order.
+    """
+    n = state.size
+    passable = _open_cells(state)
+    _set_bit(passable, start)
+    parents = np.full(n, -1, np.int32)
+    back_parents = np.full(n, -1, np.int32)
+    dist = np.full(n, -1, np.int32)
+    back_dist = np.full(n, -1, np.int32)
+    order = np.empty(n, np.int32)
+    queue = np.empty(n, np.int32)
+    back_queue = np.empty(n, np.int32)
+    dist[start] = back_dist[goal] = 0
+    queue[0] = start
+    back_queue[0] = goal
+    head = back_head = count = 0
+    tail = back_tail = 1
+    best = 2 * n
+    meet = -1
+
+    while meet == -1 and head < tail and back_head < back_tail:
+        if tail - head <= back_tail - back_head:
+            head, tail, count, best, meet = _expand_layer(neighbors, passable, queue, head, tail, dist, parents, back_dist, order, count, best, meet)
+        else:
+            back_head, back_tail, count, best, meet = _expand_layer(neighbors, passable, back_queue, back_head, back_tail, back_dist, back_parents, dist, order, count, best, meet)
+    if meet == -1:
+        return parents, order[:count] # No solution found
+
+    # Point the backward half of the path from the meeting point towards the start
+    current = meet
+    while current != goal:
+        parents[back_parents[current]] = current
+        current = back_parents[current]
+    order[count] = goal
+    count += 1
+    return parents, order[:count]
+
+@njit(cache=True)
+def dfs_nb(state, neighbors, start, goal):
+    """
+    Depth-First Search run to completion.
+
+    Like SearchManager.dfs, a neighbor that is already on the stack is moved to
+    the top and re-parented. Instead of removing it from the middle of the
+    stack, a new entry is pushed and the old one is skipped when popped.
+
+    Args:
+        state (np.ndarray): size x size uint8 array of GridState values.
+        neighbors (np.ndarray): (size * size, 4) int32 neighbor table, -1 where off the grid.
+        start (int): Flattened index of the start cell.
+        goal (int): Flattened index of the goal cell.
+
+    Returns:
+        tuple: (parents, order) - int32 ancestor index of every cell (-1 if none)
+        and the flattened indices of visited cells in visit order.
+    """
+    n = state.size
+    open_cells = _open_cells(state)
+    parents = np.full(n, -1, np.int32)
+    order = np.empty(n, np.int32)
+    closed = _bitset(n)
+    # Entries on the stack, each tagged with the generation it was pushed at
+    stack = np.empty(4 * n + 1, np.int32)
+    stack_generation = np.empty(4 * n + 1, np.int32)
+    generation = np.zeros(n, np.int32)
+    in_stack = _bitset(n)
+    top = count = 0
+
+    current = start
+    _set_bit(closed, current)
+    while True:
+        for neighbor in neighbors[current]:
+            if neighbor != -1 and _test_bit(open_cells, neighbor) and not _test_bit(closed, neighbor):
+                if _test_bit(in_stack, neighbor):
+                    generation[neighbor] += 1
+                _set_bit(in_stack, neighbor)
+                parents[neighbor] = current
+                stack[top] = neighbor
+                stack_generation[top] = generation[neighbor]
+                top += 1
+        # Pop until a live entry is found
+        current = -1
+        while top > 0:
+            top -= 1
+            if stack_generation[top] == generation[stack[top]]:
+                current = stack[top]
+                break
+        if current == -1:
+            break # No solution found
+        _clear_bit(in_stack, current)
+        _set_bit(closed, current)
+        order[count] = current
+        count += 1
+        if current == goal:
+            break
+    return parents, order[:count]
+
+# Informed
+@njit(cache=True)
+def _best_first_nb(state, neighbors, start, goal, use_cost):
+    """
+    Shared best-first search behind greedy_bfs_nb and a_star_nb.
+
+    Mirrors SearchManager.best_first_step: a cell is pushed when first
+    discovered or when a cheaper path to it is found, and outdated entries are
+    skipped when popped. Priorities are the heuristic alone, or with use_cost
+    the tie-broken A* priority (cost * n + heuristic * (n + 1)). The heap
+    lives in preallocated key, counter and cell arrays.
+    """
+    size = state.shape[0]
+    n = state.size
+    open_cells = _open_cells(state)
+    parents = np.full(n, -1, np.int32)
+    order = np.empty(n, np.int32)
+    closed = _bitset(n)
+    cost = np.full(n, n, np.int32)
+    # Every cell can be pushed at most once per neighbor
+    keys = np.empty(4 * n, np.int64)
+    counters = np.empty(4 * n, np.int64)
+    nodes = np.empty(4 * n, np.int32)
+    length = pushes = count = 0
+
+    current = start
+    cost[current] = 0
+    _set_bit(closed, current)
+    while True:
+        for neighbor in neighbors[current]:
+            if neighbor != -1 and _test_bit(open_cells, neighbor) and not _test_bit(closed, neighbor):
+                g = cost[current] + 1
+                if g < cost[neighbor]:
+                    cost[neighbor] = g
+                    parents[neighbor] = current
+                    priority = _heuristic(neighbor, goal, size)
+                    if use_cost:
+                        priority = g * n + priority * (n + 1)
+                    length = _heap_push(keys, counters, nodes, length, priority, pushes, neighbor)
+                    pushes += 1
+        # Pop until an entry for an unexplored cell is found
+        current = -1
+        while length > 0:
+            node, length = _heap_pop(keys, counters, nodes, length)
+            if not _test_bit(closed, node):
+                current = node
+                break
+        if current == -1:
+            break # No solution found
+        _set_bit(closed, current)
+        order[count] = current
+        count += 1
+        if current == goal:
+            break
+    return parents, order[:count]
+
+@njit(cache=True)
+def greedy_bfs_nb(state, neighbors, start, goal):
+    """
+    Greedy Best-First Search run to completion, prioritized by the heuristic only.
+
+    Args:
+        state (np.ndarray): size x size uint8 array of GridState values.
+        neighbors (np.ndarray): (size * size, 4) int32 neighbor table, -1 where off the grid.
+        start (int): Flattened index of the start cell.
+        goal (int): Flattened index of the goal cell.
+
+    Returns:
+        tuple: (parents, order) - int32 ancestor index of every cell (-1 if none)
+        and the flattened indices of visited cells in visit order.
+    """
+    return _best_first_nb(state, neighbors, start, goal, False)
+
+@njit(cache=True)
+def a_star_nb(state, neighbors, start, goal):
+    """
+    A* Search run to completion, prioritized by path cost plus the heuristic.
+
+    Args:
+        state (np.ndarray): size x size uint8 array of GridState values.
+        neighbors (np.ndarray): (size * size, 4) int32 neighbor table, -1 where off the grid.
+        start (int): Flattened index of the start cell.
+        goal (int): Flattened index of the goal cell.
+
+    Returns:
+        tuple: (parents, order) - int32 ancestor index of every cell (-1 if none)
+        and the flattened indices of visited cells in visit order.
+    """
+    return _best_first_nb(state, neighbors, start, goal, True)